@@ -1,17 +1,35 @@
 #!/usr/bin/env python3
 """
-API server entry point for the web application.
+Development API server entry point for the web application.
 Run with: uvicorn api_server:app --reload --host 0.0.0.0 --port 8000
+
+For production, use Gunicorn with uvicorn workers (see gunicorn.conf.py):
+gunicorn src.api:app -c gunicorn.conf.py
 """
 import uvicorn
 from src.api import app
 
+try:
+    import uvloop  # noqa: F401
+    LOOP = "uvloop"
+except ImportError:  # uvloop is not available on Windows
+    LOOP = "asyncio"
+
+try:
+    import httptools  # noqa: F401
+    HTTP = "httptools"
+except ImportError:
+    HTTP = "h11"
+
 if __name__ == "__main__":
     uvicorn.run(
         "src.api:app",
         host="0.0.0.0",
         port=8000,
         reload=True,
+        loop=LOOP,
+        http=HTTP,
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
         log_level="info"
     )
-
@@ -4,6 +4,9 @@
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
 
+// Conversation ID assigned by the backend on the first message
+let conversationId = null
+
 /**
  * Send a chat message and receive streaming response.
  * @param {string} message - The user's message
@@ -17,7 +20,7 @@ export async function sendMessage(message, onChunk, onComplete) {
       headers: {
         'Content-Type': 'application/json',
       },
-      body: JSON.stringify({ message }),
+      body: JSON.stringify({ message, conversation_id: conversationId }),
     })
 
     if (!response.ok) {
@@ -53,6 +56,10 @@ export async function sendMessage(message, onChunk, onComplete) {
             try {
               const data = JSON.parse(line.slice(6))
               
+              if (data.conversation_id) {
+                conversationId = data.conversation_id
+              }
+              
               if (data.error) {
                 if (!completed) {
                   completed = true
@@ -112,7 +119,8 @@ export async function sendMessage(message, onChunk, onComplete) {
  */
 export async function clearConversation() {
   try {
-    const response = await fetch(`${API_BASE_URL}/api/chat/clear`, {
+    const params = conversationId ? `?conversation_id=${encodeURIComponent(conversationId)}` : ''
+    const response = await fetch(`${API_BASE_URL}/api/chat/clear${params}`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
@@ -124,6 +132,7 @@ export async function clearConversation() {
       throw new Error(error.detail || 'Failed to clear conversation')
     }
 
+    conversationId = null
     return await response.json()
   } catch (error) {
     console.error('Error clearing conversation:', error)
@@ -136,7 +145,8 @@ export async function clearConversation() {
  */
 export async function getHistory() {
   try {
-    const response = await fetch(`${API_BASE_URL}/api/chat/history`, {
+    const params = conversationId ? `?conversation_id=${encodeURIComponent(conversationId)}` : ''
+    const response = await fetch(`${API_BASE_URL}/api/chat/history${params}`, {
       method: 'GET',
       headers: {
         'Content-Type': 'application/json',
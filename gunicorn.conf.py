@@ -0,0 +1,19 @@
+"""
+Gunicorn configuration for running the web API in production.
+Run with: gunicorn src.api:app -c gunicorn.conf.py
+
+Each worker is a uvicorn worker process (which picks up uvloop and httptools
+when installed), so the API scales across all available CPU cores.
+"""
+import multiprocessing
+import os
+from src.config import Config
+
+bind = os.getenv("API_BIND", "0.0.0.0:8000")
+# Without Redis, conversations live in each worker's memory, so more than
+# one worker would split a conversation's history between processes
+default_workers = multiprocessing.cpu_count() if Config.REDIS_URL else 1
+workers = int(os.getenv("API_WORKERS", default_workers))
+worker_class = "src.gunicorn_worker.ChatUvicornWorker"
+keepalive = 30
+loglevel = "info"
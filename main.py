@@ -5,6 +5,13 @@ Main entry point for the AI Chat Connector application.
 import asyncio
 from src.chat_app import main
 
-if __name__ == "__main__":
-    asyncio.run(main())
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
+if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
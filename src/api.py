@@ -2,80 +2,173 @@
 FastAPI web API for the AI Chat Connector.
 Provides REST endpoints for chat functionality with streaming support.
 """
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import BackgroundTasks, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Dict, List
-import json
-import asyncio
+import orjson
+import uuid
+import redis.asyncio as redis
 from src.config import Config
 from src.conversation_manager import ConversationManager
-from src.openai_client import OpenAIClient
+from src.openai_client import OpenAIClient, ResponseStream
+from src.response_cache import ExactCache, SemanticCache
+from src.session_store import SessionStore
+
+
+def should_summarize() -> bool:
+    """
+    Whether to summarize turns that fall out of the history window.
+    
+    The Responses API keeps history server-side and never receives the
+    summary note, so summarizing in that mode would only cost API calls.
+    """
+    return Config.SUMMARIZE_HISTORY and not Config.OPENAI_USE_RESPONSES_API
+
+
+# Conversations are stored per conversation ID (in Redis when REDIS_URL is set).
+# Turns that leave the history window are only kept if they will be summarized.
+redis_client = redis.from_url(Config.REDIS_URL, decode_responses=True) if Config.REDIS_URL else None
+session_store = SessionStore(redis_client, summarize=should_summarize())
+exact_cache = ExactCache(redis_client) if Config.EXACT_CACHE_ENABLED else None
+semantic_cache = SemanticCache(redis_client) if Config.SEMANTIC_CACHE_ENABLED else None
+openai_client = OpenAIClient(exact_cache=exact_cache, semantic_cache=semantic_cache)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Validate configuration and warm up clients on startup, close them on shutdown."""
+    try:
+        Config.validate()
+        await openai_client.warmup()
+    except Exception as e:
+        print(f"Warning: {e}")
+    
+    yield
+    
+    await openai_client.close()
+    await session_store.close()
+
 
 # Initialize FastAPI app
-app = FastAPI(title="AI Chat Connector API", version="1.0.0")
+app = FastAPI(title="AI Chat Connector API", version="1.0.0", lifespan=lifespan)
 
 # Configure CORS to allow React frontend
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://localhost:5173"],  # React dev servers
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    expose_headers=[],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
-# Global conversation manager (in production, use session management)
-conversation_manager = ConversationManager()
-openai_client = OpenAIClient()
-
+# Compress larger JSON responses such as long conversation histories.
+# The SSE stream opts out via its Content-Encoding header (gzip would buffer it).
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 class ChatMessage(BaseModel):
     """Request model for chat messages."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
     message: str
-    conversation_id: Optional[str] = None  # For future session management
+    conversation_id: Optional[str] = None  # Omit to start a new conversation
 
 
 class ChatResponse(BaseModel):
     """Response model for chat messages."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
     response: str
     conversation_id: Optional[str] = None
 
 
 class ClearResponse(BaseModel):
     """Response model for clear conversation."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
     message: str
     success: bool
 
 
 class HistoryResponse(BaseModel):
     """Response model for conversation history."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
     messages: List[Dict[str, str]]
     conversation_length: int
+    conversation_id: Optional[str] = None
+
+
+# Server-Sent Events framing, encoded once
+SSE_PREFIX = b"data: "
+SSE_SUFFIX = b"\n\n"
+
 
+def sse_event(data: Dict) -> bytes:
+    """Encode a dictionary as a Server-Sent Events data frame."""
+    return SSE_PREFIX + orjson.dumps(data) + SSE_SUFFIX
 
-@app.on_event("startup")
-async def startup_event():
-    """Validate configuration on startup."""
+
+def responses_input(conversation: ConversationManager, user_message: str):
+    """
+    Build the Responses API input for the latest user turn.
+    
+    Chained turns only send the new message. Without a previous response
+    (new or cleared conversation, or one started with the Chat Completions
+    API) the full history is sent to start the chain.
+    """
+    if conversation.last_response_id:
+        return user_message
+    return conversation.get_messages()
+
+
+async def summarize_history(conversation_id: str, conversation: ConversationManager) -> None:
+    """
+    Fold turns that left the history window into the stored summary.
+    
+    Runs after the turn has been saved and answered, so it never delays or
+    fails a reply: errors are reported and the turns are summarized on a
+    later request. The summary is merged into the latest stored state, as
+    the next turn may have been saved while the summary was generated.
+    """
     try:
-        Config.validate()
-    except ValueError as e:
-        print(f"Warning: {e}")
+        summarized = len(conversation.dropped)
+        if not await conversation.summarize_dropped(openai_client):
+            return
+        latest = await session_store.load(conversation_id)
+        if not latest.get_conversation_length():
+            return  # Cleared or expired in the meantime
+        latest.summary = conversation.summary
+        latest.dropped = latest.dropped[summarized:]
+        await session_store.save(conversation_id, latest)
+    except Exception as e:
+        print(f"Warning: history summary failed: {e}")
+
+
+# Static JSON bodies, serialized once at import. Configuration is read from
+# the environment at startup and does not change while the server runs.
+ROOT_BODY = orjson.dumps({
+    "message": "AI Chat Connector API",
+    "version": "1.0.0",
+    "endpoints": {
+        "POST /api/chat": "Send a chat message and get streaming response",
+        "POST /api/chat/sync": "Send a chat message and get complete response",
+        "POST /api/chat/clear": "Clear conversation history",
+        "GET /api/chat/history": "Get conversation history"
+    }
+})
+HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "api_key_configured": bool(Config.OPENAI_API_KEY),
+    "model": Config.OPENAI_MODEL
+})
 
 
 @app.get("/")
 async def root():
     """Root endpoint."""
-    return {
-        "message": "AI Chat Connector API",
-        "version": "1.0.0",
-        "endpoints": {
-            "POST /api/chat": "Send a chat message and get streaming response",
-            "POST /api/chat/sync": "Send a chat message and get complete response",
-            "POST /api/chat/clear": "Clear conversation history",
-            "GET /api/chat/history": "Get conversation history"
-        }
-    }
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 
 @app.post("/api/chat")
@@ -87,30 +180,52 @@ async def chat_stream(message: ChatMessage):
     if not message.message or not message.message.strip():
         raise HTTPException(status_code=400, detail="Message cannot be empty")
     
+    conversation_id = message.conversation_id or str(uuid.uuid4())
+    conversation = await session_store.load(conversation_id)
+    
     # Add user message to conversation
-    conversation_manager.add_user_message(message.message.strip())
+    user_message = message.message.strip()
+    conversation.add_user_message(user_message)
     
     async def generate_stream():
         """Generator function for streaming response."""
         try:
-            full_response = ""
-            messages = conversation_manager.get_messages()
+            parts = []
+            if Config.OPENAI_USE_RESPONSES_API:
+                stream = openai_client.chat_completion_resp(
+                    conversation.last_response_id,
+                    responses_input(conversation, user_message)
+                )
+            else:
+                stream = openai_client.chat_completion(conversation.get_messages(), stream=True)
             
             # Get streaming response from OpenAI
-            async for chunk in openai_client.chat_completion(messages, stream=True):
-                full_response += chunk
+            async for chunk in stream:
+                parts.append(chunk)
                 # Send chunk as SSE formatted data
-                yield f"data: {json.dumps({'chunk': chunk, 'done': False})}\n\n"
+                yield sse_event({"chunk": chunk, "done": False})
             
             # Add assistant response to conversation history
-            conversation_manager.add_assistant_message(full_response)
+            full_response = "".join(parts)
+            conversation.add_assistant_message(full_response)
+            if isinstance(stream, ResponseStream):
+                conversation.last_response_id = stream.response_id
+            await session_store.save(conversation_id, conversation)
             
             # Send final message indicating completion
-            yield f"data: {json.dumps({'chunk': '', 'done': True, 'full_response': full_response})}\n\n"
+            yield sse_event({
+                "chunk": "",
+                "done": True,
+                "full_response": full_response,
+                "conversation_id": conversation_id
+            })
+            
+            # Summarize once the client has the complete reply
+            await summarize_history(conversation_id, conversation)
             
         except Exception as e:
             error_msg = f"Error: {str(e)}"
-            yield f"data: {json.dumps({'error': error_msg, 'done': True})}\n\n"
+            yield sse_event({"error": error_msg, "done": True, "conversation_id": conversation_id})
     
     return StreamingResponse(
         generate_stream(),
@@ -118,13 +233,14 @@ async def chat_stream(message: ChatMessage):
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
+            "Content-Encoding": "identity",  # Keep GZipMiddleware from buffering the stream
             "X-Accel-Buffering": "no"  # Disable buffering in nginx
         }
     )
 
 
-@app.post("/api/chat/sync", response_model=ChatResponse)
-async def chat_sync(message: ChatMessage):
+@app.post("/api/chat/sync")
+async def chat_sync(message: ChatMessage, background_tasks: BackgroundTasks) -> ChatResponse:
     """
     Send a chat message and receive a complete response (non-streaming).
     Useful for testing or when streaming is not needed.
@@ -133,27 +249,40 @@ async def chat_sync(message: ChatMessage):
         raise HTTPException(status_code=400, detail="Message cannot be empty")
     
     try:
+        conversation_id = message.conversation_id or str(uuid.uuid4())
+        conversation = await session_store.load(conversation_id)
+        
         # Add user message to conversation
-        conversation_manager.add_user_message(message.message.strip())
+        user_message = message.message.strip()
+        conversation.add_user_message(user_message)
         
         # Get complete response from OpenAI
-        messages = conversation_manager.get_messages()
-        response = await openai_client.chat_completion_sync(messages)
+        if Config.OPENAI_USE_RESPONSES_API:
+            response, conversation.last_response_id = await openai_client.chat_completion_resp_sync(
+                conversation.last_response_id,
+                responses_input(conversation, user_message)
+            )
+        else:
+            response = await openai_client.chat_completion_sync(conversation.get_messages())
         
         # Add assistant response to conversation history
-        conversation_manager.add_assistant_message(response)
+        conversation.add_assistant_message(response)
+        await session_store.save(conversation_id, conversation)
+        # Summarize after the response has been sent
+        background_tasks.add_task(summarize_history, conversation_id, conversation)
         
-        return ChatResponse(response=response)
+        return ChatResponse(response=response, conversation_id=conversation_id)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing message: {str(e)}")
 
 
-@app.post("/api/chat/clear", response_model=ClearResponse)
-async def clear_conversation():
+@app.post("/api/chat/clear")
+async def clear_conversation(conversation_id: Optional[str] = None) -> ClearResponse:
     """Clear the conversation history (keeps system message)."""
     try:
-        conversation_manager.clear()
+        if conversation_id:
+            await session_store.delete(conversation_id)
         return ClearResponse(
             message="Conversation history cleared successfully",
             success=True
@@ -162,14 +291,15 @@ async def clear_conversation():
         raise HTTPException(status_code=500, detail=f"Error clearing conversation: {str(e)}")
 
 
-@app.get("/api/chat/history", response_model=HistoryResponse)
-async def get_history():
-    """Get the current conversation history."""
+@app.get("/api/chat/history")
+async def get_history(conversation_id: Optional[str] = None) -> HistoryResponse:
+    """Get the conversation history for a conversation ID."""
     try:
-        messages = conversation_manager.get_messages()
+        conversation = await session_store.load(conversation_id)
         return HistoryResponse(
-            messages=messages,
-            conversation_length=conversation_manager.get_conversation_length()
+            messages=conversation.get_messages(),
+            conversation_length=conversation.get_conversation_length(),
+            conversation_id=conversation_id
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving history: {str(e)}")
@@ -178,9 +308,5 @@ async def get_history():
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "api_key_configured": bool(Config.OPENAI_API_KEY),
-        "model": Config.OPENAI_MODEL
-    }
+    return Response(content=HEALTH_BODY, media_type="application/json")
 
@@ -3,11 +3,18 @@ Main chat application with async input/output handling.
 """
 import asyncio
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from src.config import Config
 from src.conversation_manager import ConversationManager
 from src.openai_client import OpenAIClient
 
+# Streamed output is flushed once this many characters are buffered,
+# or this many seconds have passed since the last flush
+FLUSH_CHARS = 32
+FLUSH_INTERVAL = 0.02
+
 
 class ChatApp:
     """
@@ -21,6 +28,17 @@ class ChatApp:
         self.conversation = ConversationManager()
         self.client = OpenAIClient()
         self.running = True
+        # Dedicated thread for blocking stdin reads, so they never tie up
+        # the event loop's default executor
+        self._stdin_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stdin")
+        # Slash commands (without the slash) mapped to their handlers
+        self._commands = {
+            "quit": self._cmd_exit,
+            "exit": self._cmd_exit,
+            "clear": self._cmd_clear,
+            "help": self._cmd_help,
+            "history": self._cmd_history,
+        }
     
     async def get_user_input(self) -> Optional[str]:
         """
@@ -29,11 +47,11 @@ class ChatApp:
         Returns:
             User input string, or None if input is empty/whitespace.
         """
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         try:
             # Use input() instead of sys.stdin.readline() for better Windows compatibility
             # input() will handle the prompt and wait for user input
-            user_input = await loop.run_in_executor(None, lambda: input("You: "))
+            user_input = await loop.run_in_executor(self._stdin_executor, input, "You: ")
             return user_input.strip() if user_input else None
         except (EOFError, KeyboardInterrupt):
             return None
@@ -48,15 +66,24 @@ class ChatApp:
         Returns:
             Complete accumulated response.
         """
-        full_response = ""
+        parts = []
+        buffered = 0
+        last_flush = time.monotonic()
         print("\nAssistant: ", end="", flush=True)
         
         async for chunk in stream:
-            print(chunk, end="", flush=True)
-            full_response += chunk
+            sys.stdout.write(chunk)
+            parts.append(chunk)
+            buffered += len(chunk)
+            # Batch flushes to avoid a write syscall per token
+            if buffered >= FLUSH_CHARS or time.monotonic() - last_flush > FLUSH_INTERVAL:
+                sys.stdout.flush()
+                buffered = 0
+                last_flush = time.monotonic()
         
+        sys.stdout.flush()
         print("\n")  # New line after response
-        return full_response
+        return "".join(parts)
     
     async def process_message(self, user_input: str) -> None:
         """
@@ -84,6 +111,13 @@ class ChatApp:
         except Exception as e:
             error_msg = f"Error: {str(e)}"
             print(f"\n{error_msg}\n")
+            return
+        
+        # Summarizing is best-effort; the dropped turns are retried next time
+        try:
+            await self.conversation.summarize_dropped(self.client)
+        except Exception as e:
+            print(f"\nWarning: could not summarize earlier messages: {str(e)}\n")
     
     def print_welcome(self) -> None:
         """Print welcome message and instructions."""
@@ -98,6 +132,39 @@ class ChatApp:
         print("  Type '/help' to show this help message")
         print("\n" + "-"*60 + "\n")
     
+    async def _cmd_exit(self) -> bool:
+        """Exit the application."""
+        print("\nGoodbye!\n")
+        return True
+    
+    async def _cmd_clear(self) -> bool:
+        """Clear the conversation history."""
+        self.conversation.clear()
+        print("\nConversation history cleared.\n")
+        return False
+    
+    async def _cmd_help(self) -> bool:
+        """Show the help message."""
+        self.print_welcome()
+        return False
+    
+    async def _cmd_history(self) -> bool:
+        """Show conversation history for debugging."""
+        print("\n" + "="*60)
+        print("Conversation History:")
+        print("="*60)
+        for i, msg in enumerate(self.conversation.get_messages()):
+            role = msg["role"].upper()
+            content = msg["content"][:100] + "..." if len(msg["content"]) > 100 else msg["content"]
+            print(f"\n[{i}] {role}: {content}")
+        print("\n" + "="*60 + "\n")
+        return False
+    
+    def _cmd_unknown(self, command: str) -> bool:
+        """Report an unrecognized command."""
+        print(f"\nUnknown command: /{command}\n")
+        return False
+    
     async def handle_command(self, command: str) -> bool:
         """
         Handle special commands.
@@ -109,35 +176,13 @@ class ChatApp:
             True if the command should exit the app, False otherwise.
         """
         command = command.lower()
-        
-        if command in ['quit', 'exit']:
-            print("\nGoodbye!\n")
-            return True
-        
-        elif command == 'clear':
-            self.conversation.clear()
-            print("\nConversation history cleared.\n")
-            return False
-        
-        elif command == 'help':
-            self.print_welcome()
-            return False
-        
-        elif command == 'history':
-            # Show conversation history for debugging
-            print("\n" + "="*60)
-            print("Conversation History:")
-            print("="*60)
-            for i, msg in enumerate(self.conversation.get_messages()):
-                role = msg["role"].upper()
-                content = msg["content"][:100] + "..." if len(msg["content"]) > 100 else msg["content"]
-                print(f"\n[{i}] {role}: {content}")
-            print("\n" + "="*60 + "\n")
-            return False
-        
-        else:
-            print(f"\nUnknown command: /{command}\n")
-            return False
+        handler = self._commands.get(command)
+        return await handler() if handler else self._cmd_unknown(command)
+    
+    def close(self) -> None:
+        """Release the stdin reader thread."""
+        # Don't wait: the thread may still be blocked in input()
+        self._stdin_executor.shutdown(wait=False, cancel_futures=True)
     
     async def run(self) -> None:
         """Main application loop."""
@@ -172,7 +217,10 @@ class ChatApp:
 async def main():
     """Entry point for the chat application."""
     app = ChatApp()
-    await app.run()
+    try:
+        await app.run()
+    finally:
+        app.close()
 
 
 if __name__ == "__main__":
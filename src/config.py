@@ -14,6 +14,27 @@ class Config:
     # OpenAI API Configuration
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    # Chain turns with the Responses API (previous_response_id) so only the
+    # new user message is sent each turn. Requires a model that supports it.
+    OPENAI_USE_RESPONSES_API = os.getenv("OPENAI_USE_RESPONSES_API", "false").lower() == "true"
+    
+    # Conversation history window. Older turns are dropped (0 keeps everything)
+    # and, if enabled, summarized into a note sent with later requests.
+    HISTORY_MAX_TURNS = int(os.getenv("HISTORY_MAX_TURNS", "20"))
+    SUMMARIZE_HISTORY = os.getenv("SUMMARIZE_HISTORY", "false").lower() == "true"
+    
+    # Session storage (web API). Without REDIS_URL, conversations are kept
+    # in process memory and are not shared between workers.
+    REDIS_URL = os.getenv("REDIS_URL")
+    SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "1800"))
+    
+    # Response caching (web API). Uses Redis when REDIS_URL is set.
+    RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+    EXACT_CACHE_ENABLED = os.getenv("EXACT_CACHE_ENABLED", "true").lower() == "true"
+    SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+    OPENAI_EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+    OPENAI_EMBEDDING_DIMENSIONS = int(os.getenv("OPENAI_EMBEDDING_DIMENSIONS", "256"))
     
     @classmethod
     def validate(cls) -> None:
@@ -1,37 +1,116 @@
 """
 Conversation memory manager for maintaining chat history.
 """
-from typing import List, Dict, Any
+from collections import deque
+from typing import Deque, List, Dict, Any, Optional
+from src.config import Config
+
+SUMMARY_PROMPT = (
+    "Summarize the following excerpt of a conversation between a user and an "
+    "AI assistant in a few sentences. Keep any facts, names, preferences and "
+    "decisions the assistant may need to refer back to later."
+)
 
 
 class ConversationManager:
     """
     Manages conversation history and context for the chat application.
     
-    Maintains a list of messages in the format expected by OpenAI's API,
-    allowing for conversation continuity across multiple interactions.
+    Maintains the system message and a window of user/assistant messages,
+    provided in the format expected by OpenAI's API, allowing for
+    conversation continuity across multiple interactions.
+    
+    Only the most recent turns are kept so the prompt sent to OpenAI stays
+    bounded. Older messages are discarded, or, with summarizing enabled,
+    collected until they are condensed into a summary that is sent along
+    as a system note.
     """
     
-    def __init__(self, system_message: str = None):
+    def __init__(
+        self,
+        system_message: str = None,
+        max_turns: Optional[int] = None,
+        summarize: Optional[bool] = None
+    ):
         """
         Initialize the conversation manager.
         
         Args:
             system_message: Optional system message to set the assistant's behavior.
                            If None, a default helpful assistant message is used.
+            max_turns: Number of user/assistant turns to keep. If None, uses
+                       Config.HISTORY_MAX_TURNS. 0 keeps the full history.
+            summarize: Whether messages that leave the window are kept for
+                       summarize_dropped(). If None, uses Config.SUMMARIZE_HISTORY.
         """
-        self.messages: List[Dict[str, str]] = []
+        self.max_turns = Config.HISTORY_MAX_TURNS if max_turns is None else max_turns
+        self.summarize = Config.SUMMARIZE_HISTORY if summarize is None else summarize
+        # User/assistant messages; the deque evicts the oldest once the window is full
+        self.messages: Deque[Dict[str, str]] = deque(maxlen=2 * self.max_turns or None)
+        # Summary of messages that fell out of the window, and those not yet summarized
+        self.summary: Optional[str] = None
+        self.dropped: List[Dict[str, str]] = []
+        # ID of the latest OpenAI Responses API reply, used to chain turns
+        self.last_response_id: Optional[str] = None
         
         if system_message:
-            self.messages.append({
+            self._system = {
                 "role": "system",
                 "content": system_message
-            })
+            }
         else:
-            self.messages.append({
+            self._system = {
                 "role": "system",
                 "content": "You are a helpful AI assistant. You are having a conversation with a user, and you should remember and reference previous messages in this conversation. Maintain context throughout the conversation."
-            })
+            }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], summarize: Optional[bool] = None) -> "ConversationManager":
+        """
+        Rebuild a conversation manager from its stored state.
+        
+        Args:
+            data: Dictionary as returned by to_dict().
+            summarize: Whether to keep messages for summarizing. If None,
+                       uses Config.SUMMARIZE_HISTORY.
+        
+        Returns:
+            A ConversationManager holding the given history.
+        """
+        messages = data["messages"]
+        if messages and messages[0]["role"] == "system":
+            manager = cls(system_message=messages[0]["content"], summarize=summarize)
+            messages = messages[1:]
+        else:
+            manager = cls(summarize=summarize)
+        manager.summary = data.get("summary")
+        if manager.summarize:
+            manager.dropped = data.get("dropped", [])
+        # Go through _append so history beyond the window is kept for summarizing
+        for message in messages:
+            manager._append(message)
+        manager.last_response_id = data.get("last_response_id")
+        return manager
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the conversation state for storage.
+        
+        Returns:
+            JSON-serializable dictionary that from_dict() can restore.
+        """
+        return {
+            "messages": [self._system, *self.messages],
+            "summary": self.summary,
+            "dropped": self.dropped,
+            "last_response_id": self.last_response_id
+        }
+    
+    def _append(self, message: Dict[str, str]) -> None:
+        """Append a message, moving the oldest one out of a full window."""
+        if self.summarize and len(self.messages) == self.messages.maxlen:
+            self.dropped.append(self.messages[0])
+        self.messages.append(message)
     
     def add_user_message(self, content: str) -> None:
         """
@@ -40,7 +119,7 @@ class ConversationManager:
         Args:
             content: The user's message content.
         """
-        self.messages.append({
+        self._append({
             "role": "user",
             "content": content
         })
@@ -52,29 +131,63 @@ class ConversationManager:
         Args:
             content: The assistant's message content.
         """
-        self.messages.append({
+        self._append({
             "role": "assistant",
             "content": content
         })
     
+    async def summarize_dropped(self, client: Any, min_messages: int = None) -> bool:
+        """
+        Fold messages that fell out of the window into the running summary.
+        
+        Args:
+            client: OpenAIClient used to generate the summary.
+            min_messages: Only summarize once at least this many messages
+                          have been dropped, to batch summary requests.
+                          If None, uses max_turns.
+        
+        Returns:
+            True if a new summary was generated.
+        """
+        if min_messages is None:
+            min_messages = self.max_turns
+        if not self.dropped or len(self.dropped) < min_messages:
+            return False
+        
+        excerpt = "\n".join(f"{msg['role']}: {msg['content']}" for msg in self.dropped)
+        if self.summary:
+            excerpt = f"Summary so far: {self.summary}\n\n{excerpt}"
+        # Summaries must never be served from or shared through the response
+        # caches: every request has the same prefix, so they would leak between users
+        self.summary = await client.chat_completion_sync([
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": excerpt}
+        ], use_cache=False)
+        self.dropped = []
+        return True
+    
     def get_messages(self) -> List[Dict[str, str]]:
         """
         Get the current conversation history.
         
         Returns:
-            List of message dictionaries in OpenAI format.
+            List of message dictionaries in OpenAI format: the system message,
+            the summary of earlier messages (if any), then the recent turns.
         """
-        return self.messages.copy()
+        if self.summary:
+            note = {"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"}
+            return [self._system, note, *self.messages]
+        return [self._system, *self.messages]
     
     def clear(self) -> None:
         """
         Clear the conversation history (except system message).
         """
-        # Keep only the system message
-        system_msg = self.messages[0] if self.messages and self.messages[0]["role"] == "system" else None
-        self.messages = []
-        if system_msg:
-            self.messages.append(system_msg)
+        # The system message is kept separately, so only the turns are cleared
+        self.messages.clear()
+        self.summary = None
+        self.dropped = []
+        self.last_response_id = None
     
     def get_conversation_length(self) -> int:
         """
@@ -83,5 +196,5 @@ class ConversationManager:
         Returns:
             Number of user/assistant message pairs.
         """
-        return len([msg for msg in self.messages if msg["role"] != "system"])
+        return len(self.messages)
 
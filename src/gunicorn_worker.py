@@ -0,0 +1,15 @@
+"""
+Gunicorn worker class for running the web API in production.
+"""
+from uvicorn_worker import UvicornWorker
+
+
+class ChatUvicornWorker(UvicornWorker):
+    """
+    Uvicorn worker with a per-worker concurrency limit.
+    
+    Gunicorn's worker_connections setting is not passed on to uvicorn,
+    so the limit is set through the worker's uvicorn config instead.
+    """
+    
+    CONFIG_KWARGS = {"loop": "auto", "http": "auto", "limit_concurrency": 1000}
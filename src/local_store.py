@@ -0,0 +1,89 @@
+"""
+In-process key/value store used when Redis is not configured.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class ExpiringDict:
+    """
+    Dictionary with a per-entry expiry and a maximum size.
+    
+    Entries are kept in the order they were last written. Because every
+    entry has the same TTL, that is also the order in which they expire,
+    so expired entries are pruned from the front on each write, and the
+    oldest entry is evicted once the store is full. Expired entries are
+    never returned.
+    """
+    
+    def __init__(self, ttl: int, max_entries: int):
+        """
+        Initialize the store.
+        
+        Args:
+            ttl: Seconds before an entry expires.
+            max_entries: Maximum number of entries to keep.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        """Get the number of stored entries, including any not yet pruned."""
+        return len(self._data)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get an entry.
+        
+        Args:
+            key: The entry key.
+            default: Value to return if the key is missing or expired.
+        
+        Returns:
+            The stored value, or default.
+        """
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        return value
+    
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store an entry, resetting its expiry.
+        
+        Args:
+            key: The entry key.
+            value: The value to store.
+        """
+        now = time.monotonic()
+        self._data[key] = (now + self.ttl, value)
+        self._data.move_to_end(key)
+        
+        # Prune expired entries from the front, then enforce the size limit
+        while self._data:
+            expires_at, _ = next(iter(self._data.values()))
+            if expires_at > now:
+                break
+            self._data.popitem(last=False)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+    
+    def pop(self, key: str, default: Any = None) -> Optional[Any]:
+        """
+        Remove an entry.
+        
+        Args:
+            key: The entry key.
+            default: Value to return if the key is missing.
+        
+        Returns:
+            The removed value, or default.
+        """
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
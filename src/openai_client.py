@@ -2,9 +2,81 @@
 OpenAI API client for chat completions with streaming support.
 """
 import asyncio
-from typing import AsyncIterator, List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple, Union
+import httpx
 from openai import AsyncOpenAI
 from src.config import Config
+from src.response_cache import ExactCache, SemanticCache, messages_hash, prefix_hash
+
+# Size of the chunks a cached response is replayed in when streaming
+CACHE_REPLAY_CHUNK_SIZE = 64
+
+# HTTP connection pool sized for many concurrent streams to OpenAI
+HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100, keepalive_expiry=60)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create the HTTP client used for OpenAI requests.
+    
+    Uses HTTP/2 so concurrent requests share connections, a large
+    keep-alive pool, and retries for failed connection attempts.
+    
+    Returns:
+        A configured httpx.AsyncClient.
+    """
+    transport = httpx.AsyncHTTPTransport(http2=True, limits=HTTP_LIMITS, retries=2)
+    return httpx.AsyncClient(transport=transport, timeout=HTTP_TIMEOUT)
+
+
+class ResponseStream:
+    """
+    Async iterator over the text of an OpenAI Responses API reply.
+    
+    Once iteration has finished, ``response_id`` holds the ID of the reply,
+    which can be passed as ``previous_response_id`` on the next turn.
+    """
+    
+    def __init__(self, client: AsyncOpenAI, **request: Any):
+        """
+        Initialize the response stream.
+        
+        Args:
+            client: The AsyncOpenAI client to send the request with.
+            **request: Keyword arguments for ``client.responses.create``.
+        """
+        self._client = client
+        self._request = request
+        self.response_id: Optional[str] = None
+    
+    async def __aiter__(self) -> AsyncIterator[str]:
+        """
+        Send the request and yield chunks of the reply as they arrive.
+        
+        Raises:
+            Exception: If the API request fails.
+        """
+        try:
+            response = await self._client.responses.create(**self._request)
+            
+            if not self._request.get("stream"):
+                self.response_id = response.id
+                yield response.output_text
+                return
+            
+            async for event in response:
+                if event.type == "response.created":
+                    self.response_id = event.response.id
+                elif event.type == "response.output_text.delta":
+                    yield event.delta
+                elif event.type == "response.failed":
+                    raise Exception(event.response.error.message)
+                elif event.type == "error":
+                    raise Exception(event.message)
+                
+        except Exception as e:
+            raise Exception(f"OpenAI API error: {str(e)}")
 
 
 class OpenAIClient:
@@ -15,29 +87,85 @@ class OpenAIClient:
     error handling and async/await patterns.
     """
     
-    def __init__(self, api_key: str = None, model: str = None):
+    def __init__(
+        self,
+        api_key: str = None,
+        model: str = None,
+        exact_cache: Optional[ExactCache] = None,
+        semantic_cache: Optional[SemanticCache] = None
+    ):
         """
         Initialize the OpenAI client.
         
         Args:
             api_key: OpenAI API key. If None, uses Config.OPENAI_API_KEY.
             model: Model to use. If None, uses Config.OPENAI_MODEL.
+            exact_cache: Optional cache for reusing responses to identical
+                         conversations.
+            semantic_cache: Optional cache for reusing responses to similar
+                            user messages in the same conversation context.
         """
         self.api_key = api_key or Config.OPENAI_API_KEY
         self.model = model or Config.OPENAI_MODEL
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        self.exact_cache = exact_cache
+        self.semantic_cache = semantic_cache
+        self.client = AsyncOpenAI(api_key=self.api_key, http_client=create_http_client())
+    
+    async def warmup(self) -> None:
+        """
+        Open a connection to the API ahead of the first chat request.
+        
+        Makes a lightweight request so the TLS handshake and connection
+        setup are not paid by the first user.
+        
+        Raises:
+            Exception: If the API request fails.
+        """
+        try:
+            await self.client.models.list()
+        except Exception as e:
+            raise Exception(f"OpenAI API error: {str(e)}")
+    
+    async def close(self) -> None:
+        """Close the underlying HTTP connections."""
+        await self.client.close()
+    
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Compute embeddings for a batch of texts in a single request.
+        
+        Args:
+            texts: The texts to embed.
+        
+        Returns:
+            One embedding vector per text, in the same order.
+        """
+        response = await self.client.embeddings.create(
+            model=Config.OPENAI_EMBEDDING_MODEL,
+            input=texts,
+            dimensions=Config.OPENAI_EMBEDDING_DIMENSIONS
+        )
+        return [item.embedding for item in response.data]
     
     async def chat_completion(
         self,
         messages: List[Dict[str, str]],
-        stream: bool = True
+        stream: bool = True,
+        use_cache: bool = True
     ) -> AsyncIterator[str]:
         """
         Send a chat completion request to OpenAI with streaming support.
         
+        If a configured cache holds a response for the same conversation
+        (exact cache), or for a similar user message in the same context
+        (semantic cache), the cached response is replayed instead, in
+        small chunks when streaming. The exact cache is checked first so
+        hits skip the embedding request.
+        
         Args:
             messages: List of message dictionaries in OpenAI format.
             stream: Whether to stream the response. Defaults to True.
+            use_cache: Whether to use the configured caches. Defaults to True.
         
         Yields:
             Chunks of the assistant's response as they arrive.
@@ -45,6 +173,12 @@ class OpenAIClient:
         Raises:
             Exception: If the API request fails.
         """
+        cached, keys = await self._cache_lookup(messages) if use_cache else (None, {})
+        if cached is not None:
+            for i in range(0, len(cached), CACHE_REPLAY_CHUNK_SIZE):
+                yield cached[i:i + CACHE_REPLAY_CHUNK_SIZE]
+            return
+        
         try:
             response = await self.client.chat.completions.create(
                 model=self.model,
@@ -52,21 +186,86 @@ class OpenAIClient:
                 stream=stream
             )
             
+            parts = []
             if stream:
                 # Stream the response chunks
                 async for chunk in response:
                     if chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
                         yield chunk.choices[0].delta.content
             else:
                 # Return the full response
+                parts.append(response.choices[0].message.content or "")
                 yield response.choices[0].message.content
-                
+            
         except Exception as e:
             raise Exception(f"OpenAI API error: {str(e)}")
+        
+        full_response = "".join(parts)
+        if full_response:
+            await self._cache_store(keys, full_response)
+    
+    async def _cache_lookup(self, messages: List[Dict[str, str]]) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        Look up a cached response for a conversation.
+        
+        Caching is best-effort: errors from a cache or the embeddings API
+        are reported and treated as a miss.
+        
+        Args:
+            messages: List of message dictionaries in OpenAI format.
+        
+        Returns:
+            Tuple of the cached response (None on a miss) and the keys
+            needed to cache the response with _cache_store().
+        """
+        keys: Dict[str, Any] = {}
+        
+        if self.exact_cache is not None:
+            try:
+                keys["digest"] = messages_hash(messages, self.model)
+                cached = await self.exact_cache.get(keys["digest"])
+                if cached is not None:
+                    return cached, keys
+            except Exception as e:
+                print(f"Warning: exact cache lookup failed: {e}")
+        
+        if self.semantic_cache is not None and messages and messages[-1]["role"] == "user":
+            try:
+                namespace = prefix_hash(messages, self.model)
+                embedding = (await self.embed([messages[-1]["content"]]))[0]
+                keys["namespace"], keys["embedding"] = namespace, embedding
+                return await self.semantic_cache.lookup(namespace, embedding), keys
+            except Exception as e:
+                print(f"Warning: semantic cache lookup failed: {e}")
+        
+        return None, keys
+    
+    async def _cache_store(self, keys: Dict[str, Any], response: str) -> None:
+        """
+        Cache a response under the keys returned by _cache_lookup().
+        
+        Errors are reported and otherwise ignored.
+        
+        Args:
+            keys: Cache keys from _cache_lookup().
+            response: The assistant's response to cache.
+        """
+        if "digest" in keys:
+            try:
+                await self.exact_cache.set(keys["digest"], response)
+            except Exception as e:
+                print(f"Warning: exact cache store failed: {e}")
+        if "embedding" in keys:
+            try:
+                await self.semantic_cache.store(keys["namespace"], keys["embedding"], response)
+            except Exception as e:
+                print(f"Warning: semantic cache store failed: {e}")
     
     async def chat_completion_sync(
         self,
-        messages: List[Dict[str, str]]
+        messages: List[Dict[str, str]],
+        use_cache: bool = True
     ) -> str:
         """
         Send a non-streaming chat completion request.
@@ -75,12 +274,64 @@ class OpenAIClient:
         
         Args:
             messages: List of message dictionaries in OpenAI format.
+            use_cache: Whether to use the configured caches. Defaults to True.
         
         Returns:
             Complete assistant response as a string.
         """
-        full_response = ""
-        async for chunk in self.chat_completion(messages, stream=False):
-            full_response += chunk
-        return full_response
-
+        parts = [chunk async for chunk in self.chat_completion(messages, stream=False, use_cache=use_cache)]
+        return "".join(parts)
+    
+    def chat_completion_resp(
+        self,
+        previous_response_id: Optional[str],
+        input: Union[str, List[Dict[str, str]]],
+        stream: bool = True
+    ) -> ResponseStream:
+        """
+        Send a turn to OpenAI's Responses API, chained to the previous reply.
+        
+        OpenAI keeps the conversation state server-side, so only the new
+        input has to be sent each turn instead of the full history. Older
+        turns are truncated server-side once the context window fills up.
+        
+        Args:
+            previous_response_id: ID of the previous reply in the conversation,
+                                  or None to start a new chain.
+            input: The new user message, or a list of message dictionaries in
+                   OpenAI format (e.g. the full history when starting a chain).
+            stream: Whether to stream the response. Defaults to True.
+        
+        Returns:
+            A ResponseStream yielding chunks of the reply. Its response_id is
+            set once iteration has finished.
+        """
+        return ResponseStream(
+            self.client,
+            model=self.model,
+            input=input,
+            previous_response_id=previous_response_id,
+            truncation="auto",
+            stream=stream
+        )
+    
+    async def chat_completion_resp_sync(
+        self,
+        previous_response_id: Optional[str],
+        input: Union[str, List[Dict[str, str]]]
+    ) -> Tuple[str, str]:
+        """
+        Send a non-streaming turn to OpenAI's Responses API.
+        
+        Args:
+            previous_response_id: ID of the previous reply in the conversation,
+                                  or None to start a new chain.
+            input: The new user message, or a list of message dictionaries in
+                   OpenAI format.
+        
+        Returns:
+            Tuple of the complete assistant response and its response ID.
+        """
+        stream = self.chat_completion_resp(previous_response_id, input, stream=False)
+        parts = [chunk async for chunk in stream]
+        return "".join(parts), stream.response_id
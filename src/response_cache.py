@@ -0,0 +1,197 @@
+"""
+Caches for reusing OpenAI responses across identical or similar requests.
+"""
+import hashlib
+import json
+import math
+from typing import Dict, List, Optional
+from src.config import Config
+from src.local_store import ExpiringDict
+
+
+def prefix_hash(messages: List[Dict[str, str]], model: str) -> str:
+    """
+    Hash the conversation context that precedes the latest message.
+    
+    Args:
+        messages: List of message dictionaries in OpenAI format.
+        model: The model the response is generated with.
+    
+    Returns:
+        Hex digest identifying the model and every message except the last.
+    """
+    prefix = json.dumps(list(messages[:-1]), sort_keys=True)
+    return hashlib.sha256((prefix + model).encode("utf-8")).hexdigest()
+
+
+def messages_hash(messages: List[Dict[str, str]], model: str) -> str:
+    """
+    Hash a full conversation, including the latest message.
+    
+    Args:
+        messages: List of message dictionaries in OpenAI format.
+        model: The model the response is generated with.
+    
+    Returns:
+        Hex digest identifying the model and every message.
+    """
+    payload = json.dumps(list(messages), sort_keys=True)
+    return hashlib.sha256((payload + model).encode("utf-8")).hexdigest()
+
+
+def cosine_similarity(a: List[float], b: List[float]) -> float:
+    """Compute the cosine similarity of two vectors."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class ExactCache:
+    """
+    Caches responses by the exact conversation they answer.
+    
+    Keys are the messages_hash of the full message list, so reruns of the
+    same history (retries, refreshes, tests) are served without calling
+    OpenAI, while editing any earlier message changes the key.
+    
+    Responses are stored under ``exact:{hash}`` and expire after the
+    configured TTL, in Redis when a client is given and in process memory
+    (up to MAX_LOCAL_ENTRIES) otherwise.
+    """
+    
+    KEY_PREFIX = "exact:"
+    MAX_LOCAL_ENTRIES = 1000
+    
+    def __init__(self, redis_client=None, ttl: int = None):
+        """
+        Initialize the exact-match cache.
+        
+        Args:
+            redis_client: Optional redis.asyncio client. If None, an
+                         in-memory store is used.
+            ttl: Seconds before cached responses expire. If None, uses
+                 Config.RESPONSE_CACHE_TTL_SECONDS.
+        """
+        self.redis = redis_client
+        self.ttl = ttl or Config.RESPONSE_CACHE_TTL_SECONDS
+        self._local = ExpiringDict(self.ttl, self.MAX_LOCAL_ENTRIES)
+    
+    def _key(self, digest: str) -> str:
+        """Build the storage key for a conversation hash."""
+        return f"{self.KEY_PREFIX}{digest}"
+    
+    async def get(self, digest: str) -> Optional[str]:
+        """
+        Get the cached response for a conversation.
+        
+        Args:
+            digest: The messages_hash of the conversation.
+        
+        Returns:
+            The cached response, or None on a miss.
+        """
+        key = self._key(digest)
+        if self.redis is not None:
+            return await self.redis.get(key)
+        return self._local.get(key)
+    
+    async def set(self, digest: str, response: str) -> None:
+        """
+        Cache the response for a conversation.
+        
+        Args:
+            digest: The messages_hash of the conversation.
+            response: The assistant's response to cache.
+        """
+        key = self._key(digest)
+        if self.redis is not None:
+            await self.redis.set(key, response, ex=self.ttl)
+        else:
+            self._local.set(key, response)
+
+
+class SemanticCache:
+    """
+    Caches responses by the meaning of the latest user message.
+    
+    Entries are grouped by a namespace (the prefix_hash of the conversation
+    context), so an answer is only reused in the same conversation context.
+    Within a namespace, the most similar cached message is a hit if its
+    cosine similarity to the query is at least the threshold.
+    
+    Each namespace is a list under ``sem:{namespace}`` that expires after
+    the configured TTL, in Redis when a client is given and in process
+    memory (up to MAX_LOCAL_NAMESPACES) otherwise.
+    """
+    
+    KEY_PREFIX = "sem:"
+    MAX_ENTRIES = 50  # Per namespace, to bound the lookup cost
+    MAX_LOCAL_NAMESPACES = 1000
+    
+    def __init__(self, redis_client=None, threshold: float = None, ttl: int = None):
+        """
+        Initialize the semantic cache.
+        
+        Args:
+            redis_client: Optional redis.asyncio client. If None, an
+                         in-memory store is used.
+            threshold: Minimum cosine similarity for a hit. If None, uses
+                       Config.SEMANTIC_CACHE_THRESHOLD.
+            ttl: Seconds before cached entries expire. If None, uses
+                 Config.RESPONSE_CACHE_TTL_SECONDS.
+        """
+        self.redis = redis_client
+        self.threshold = Config.SEMANTIC_CACHE_THRESHOLD if threshold is None else threshold
+        self.ttl = ttl or Config.RESPONSE_CACHE_TTL_SECONDS
+        self._local = ExpiringDict(self.ttl, self.MAX_LOCAL_NAMESPACES)
+    
+    def _key(self, namespace: str) -> str:
+        """Build the storage key for a namespace."""
+        return f"{self.KEY_PREFIX}{namespace}"
+    
+    async def lookup(self, namespace: str, embedding: List[float]) -> Optional[str]:
+        """
+        Find a cached response for a similar message.
+        
+        Args:
+            namespace: The conversation context namespace.
+            embedding: Embedding of the latest user message.
+        
+        Returns:
+            The cached response of the most similar entry, or None on a miss.
+        """
+        key = self._key(namespace)
+        if self.redis is not None:
+            entries = await self.redis.lrange(key, 0, -1)
+        else:
+            entries = self._local.get(key, [])
+        
+        best_response = None
+        best_score = self.threshold
+        for entry in entries:
+            data = json.loads(entry)
+            score = cosine_similarity(embedding, data["embedding"])
+            if score >= best_score:
+                best_response, best_score = data["response"], score
+        return best_response
+    
+    async def store(self, namespace: str, embedding: List[float], response: str) -> None:
+        """
+        Cache a response for a message.
+        
+        Args:
+            namespace: The conversation context namespace.
+            embedding: Embedding of the latest user message.
+            response: The assistant's response to cache.
+        """
+        key = self._key(namespace)
+        entry = json.dumps({"embedding": embedding, "response": response})
+        if self.redis is not None:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.lpush(key, entry)
+                pipe.ltrim(key, 0, self.MAX_ENTRIES - 1)
+                pipe.expire(key, self.ttl)
+                await pipe.execute()
+        else:
+            entries = [entry, *self._local.get(key, [])][:self.MAX_ENTRIES]
+            self._local.set(key, entries)
@@ -0,0 +1,101 @@
+"""
+Session store for persisting conversations between web API requests.
+"""
+import json
+from typing import Optional
+from src.config import Config
+from src.conversation_manager import ConversationManager
+from src.local_store import ExpiringDict
+
+
+class SessionStore:
+    """
+    Stores conversation histories keyed by conversation ID.
+    
+    Each conversation is saved as JSON under ``conv:{conversation_id}`` and
+    expires after a period of inactivity. With a Redis client, state is
+    shared between API workers and survives restarts. Without one,
+    conversations are kept in process memory (up to MAX_LOCAL_ENTRIES),
+    which is only suitable for a single development server.
+    """
+    
+    KEY_PREFIX = "conv:"
+    MAX_LOCAL_ENTRIES = 1000
+    
+    def __init__(self, redis_client=None, ttl: int = None, summarize: Optional[bool] = None):
+        """
+        Initialize the session store.
+        
+        Args:
+            redis_client: Optional redis.asyncio client. If None, an
+                         in-memory store is used.
+            ttl: Seconds before an idle conversation expires. If None, uses
+                 Config.SESSION_TTL_SECONDS.
+            summarize: Whether loaded conversations keep messages for
+                       summarizing. If None, uses Config.SUMMARIZE_HISTORY.
+        """
+        self.redis = redis_client
+        self.ttl = ttl or Config.SESSION_TTL_SECONDS
+        self.summarize = summarize
+        self._local = ExpiringDict(self.ttl, self.MAX_LOCAL_ENTRIES)
+    
+    def _key(self, conversation_id: str) -> str:
+        """Build the storage key for a conversation."""
+        return f"{self.KEY_PREFIX}{conversation_id}"
+    
+    async def load(self, conversation_id: Optional[str]) -> ConversationManager:
+        """
+        Load a conversation by ID.
+        
+        Args:
+            conversation_id: The conversation ID. May be None.
+        
+        Returns:
+            The stored conversation, or a new one if the ID is unknown or expired.
+        """
+        if not conversation_id:
+            return ConversationManager(summarize=self.summarize)
+        
+        key = self._key(conversation_id)
+        if self.redis is not None:
+            payload = await self.redis.get(key)
+        else:
+            payload = self._local.get(key)
+        
+        if not payload:
+            return ConversationManager(summarize=self.summarize)
+        
+        return ConversationManager.from_dict(json.loads(payload), summarize=self.summarize)
+    
+    async def save(self, conversation_id: str, conversation: ConversationManager) -> None:
+        """
+        Save a conversation, refreshing its expiry.
+        
+        Args:
+            conversation_id: The conversation ID.
+            conversation: The conversation to store.
+        """
+        key = self._key(conversation_id)
+        payload = json.dumps(conversation.to_dict())
+        if self.redis is not None:
+            await self.redis.set(key, payload, ex=self.ttl)
+        else:
+            self._local.set(key, payload)
+    
+    async def delete(self, conversation_id: str) -> None:
+        """
+        Delete a conversation.
+        
+        Args:
+            conversation_id: The conversation ID.
+        """
+        key = self._key(conversation_id)
+        if self.redis is not None:
+            await self.redis.delete(key)
+        else:
+            self._local.pop(key, None)
+    
+    async def close(self) -> None:
+        """Close the underlying Redis connection, if any."""
+        if self.redis is not None:
+            await self.redis.aclose()
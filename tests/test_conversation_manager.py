@@ -2,6 +2,7 @@
 Unit tests for ConversationManager.
 """
 import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
 from src.conversation_manager import ConversationManager
 
 
@@ -11,33 +12,36 @@ class TestConversationManager:
     def test_init_with_default_system_message(self):
         """Test initialization with default system message."""
         manager = ConversationManager()
-        assert len(manager.messages) == 1
-        assert manager.messages[0]["role"] == "system"
-        assert "helpful" in manager.messages[0]["content"].lower()
+        messages = manager.get_messages()
+        assert len(messages) == 1
+        assert messages[0]["role"] == "system"
+        assert "helpful" in messages[0]["content"].lower()
     
     def test_init_with_custom_system_message(self):
         """Test initialization with custom system message."""
         custom_message = "You are a coding assistant."
         manager = ConversationManager(system_message=custom_message)
-        assert manager.messages[0]["content"] == custom_message
+        assert manager.get_messages()[0]["content"] == custom_message
     
     def test_add_user_message(self):
         """Test adding user messages."""
         manager = ConversationManager()
         manager.add_user_message("Hello")
         
-        assert len(manager.messages) == 2
-        assert manager.messages[1]["role"] == "user"
-        assert manager.messages[1]["content"] == "Hello"
+        messages = manager.get_messages()
+        assert len(messages) == 2
+        assert messages[1]["role"] == "user"
+        assert messages[1]["content"] == "Hello"
     
     def test_add_assistant_message(self):
         """Test adding assistant messages."""
         manager = ConversationManager()
         manager.add_assistant_message("Hi there!")
         
-        assert len(manager.messages) == 2
-        assert manager.messages[1]["role"] == "assistant"
-        assert manager.messages[1]["content"] == "Hi there!"
+        messages = manager.get_messages()
+        assert len(messages) == 2
+        assert messages[1]["role"] == "assistant"
+        assert messages[1]["content"] == "Hi there!"
     
     def test_conversation_history(self):
         """Test maintaining conversation history."""
@@ -59,8 +63,9 @@ class TestConversationManager:
         manager.add_assistant_message("Hi!")
         manager.clear()
         
-        assert len(manager.messages) == 1
-        assert manager.messages[0]["role"] == "system"
+        messages = manager.get_messages()
+        assert len(messages) == 1
+        assert messages[0]["role"] == "system"
     
     def test_get_conversation_length(self):
         """Test getting conversation length excluding system message."""
@@ -72,4 +77,128 @@ class TestConversationManager:
         
         manager.add_assistant_message("Hi!")
         assert manager.get_conversation_length() == 2
-
+    
+    def test_history_window_drops_oldest_messages(self):
+        """Test that only the most recent turns are kept."""
+        manager = ConversationManager(max_turns=2, summarize=True)
+        for i in range(3):
+            manager.add_user_message(f"Question {i}")
+            manager.add_assistant_message(f"Answer {i}")
+        
+        messages = manager.get_messages()
+        assert len(messages) == 5
+        assert messages[0]["role"] == "system"
+        assert messages[1]["content"] == "Question 1"
+        assert [msg["content"] for msg in manager.dropped] == ["Question 0", "Answer 0"]
+    
+    def test_history_window_discards_without_summarizing(self):
+        """Test that messages leaving the window are not kept when summarizing is off."""
+        manager = ConversationManager(max_turns=2, summarize=False)
+        for i in range(500):
+            manager.add_user_message(f"Question {i}")
+            manager.add_assistant_message(f"Answer {i}")
+        
+        assert manager.get_conversation_length() == 4
+        assert manager.dropped == []
+        assert manager.to_dict()["dropped"] == []
+    
+    def test_history_window_disabled(self):
+        """Test that max_turns=0 keeps the full history."""
+        manager = ConversationManager(max_turns=0)
+        for i in range(30):
+            manager.add_user_message(f"Question {i}")
+        
+        assert manager.get_conversation_length() == 30
+    
+    @pytest.mark.asyncio
+    async def test_state_stays_bounded_when_summarizing(self):
+        """Test that a long session keeps a bounded window and dropped list."""
+        manager = ConversationManager(max_turns=2, summarize=True)
+        client = MagicMock()
+        client.chat_completion_sync = AsyncMock(return_value="Earlier chat.")
+        for i in range(500):
+            manager.add_user_message(f"Question {i}")
+            manager.add_assistant_message(f"Answer {i}")
+            await manager.summarize_dropped(client)
+        
+        assert manager.get_conversation_length() == 4
+        assert len(manager.dropped) < 2
+        assert len(manager.to_dict()["messages"]) == 5
+    
+    def test_get_messages_layout(self):
+        """Test that get_messages builds [system, summary note, *turns] as a new list."""
+        manager = ConversationManager(system_message="Be brief.")
+        manager.add_user_message("Hello")
+        manager.summary = "Earlier chat."
+        
+        messages = manager.get_messages()
+        assert [msg["role"] for msg in messages] == ["system", "system", "user"]
+        assert messages[0]["content"] == "Be brief."
+        assert "Earlier chat." in messages[1]["content"]
+        
+        messages.append({"role": "user", "content": "Not stored"})
+        assert manager.get_conversation_length() == 1
+    
+    @pytest.mark.asyncio
+    async def test_summarize_dropped(self):
+        """Test that dropped messages are summarized into a system note."""
+        manager = ConversationManager(max_turns=1, summarize=True)
+        manager.add_user_message("My name is Ada.")
+        manager.add_assistant_message("Hi Ada!")
+        manager.add_user_message("What is my name?")
+        
+        client = MagicMock()
+        client.chat_completion_sync = AsyncMock(return_value="The user is called Ada.")
+        assert await manager.summarize_dropped(client, min_messages=3) is False
+        assert await manager.summarize_dropped(client, min_messages=1) is True
+        
+        client.chat_completion_sync.assert_called_once()
+        assert client.chat_completion_sync.call_args.kwargs["use_cache"] is False
+        
+        messages = manager.get_messages()
+        assert manager.dropped == []
+        assert messages[1]["role"] == "system"
+        assert "The user is called Ada." in messages[1]["content"]
+        assert messages[2]["content"] == "Hi Ada!"
+    
+    def test_to_dict_round_trip(self):
+        """Test restoring a conversation from its stored state."""
+        manager = ConversationManager(system_message="Be brief.")
+        manager.add_user_message("Hello")
+        manager.summary = "Earlier chat."
+        manager.last_response_id = "resp_1"
+        
+        restored = ConversationManager.from_dict(manager.to_dict())
+        
+        assert restored.get_messages() == manager.get_messages()
+        assert restored.last_response_id == "resp_1"
+    
+    def test_from_dict_records_overflow(self):
+        """Test that restored history beyond the window is recorded as dropped."""
+        manager = ConversationManager(max_turns=0)
+        for i in range(3):
+            manager.add_user_message(f"Question {i}")
+            manager.add_assistant_message(f"Answer {i}")
+        
+        data = manager.to_dict()
+        data["dropped"] = [{"role": "user", "content": "Earlier question"}]
+        with patch("src.conversation_manager.Config.HISTORY_MAX_TURNS", 1):
+            restored = ConversationManager.from_dict(data, summarize=True)
+        
+        assert restored.get_conversation_length() == 2
+        assert restored.dropped[0]["content"] == "Earlier question"
+        assert [m["content"] for m in restored.dropped[1:]] == [
+            "Question 0", "Answer 0", "Question 1", "Answer 1"
+        ]
+    
+    def test_from_dict_ignores_dropped_without_summarizing(self):
+        """Test that stored dropped messages are not restored when summarizing is off."""
+        manager = ConversationManager(max_turns=1, summarize=True)
+        for i in range(2):
+            manager.add_user_message(f"Question {i}")
+            manager.add_assistant_message(f"Answer {i}")
+        
+        restored = ConversationManager.from_dict(manager.to_dict(), summarize=False)
+        
+        assert restored.get_conversation_length() == 2
+        assert restored.dropped == []
@@ -0,0 +1,60 @@
+"""
+Unit tests for ExpiringDict.
+"""
+import pytest
+from unittest.mock import patch
+from src.local_store import ExpiringDict
+
+
+class TestExpiringDict:
+    """Test cases for ExpiringDict."""
+    
+    def test_get_and_set(self):
+        """Test storing and retrieving an entry."""
+        store = ExpiringDict(ttl=60, max_entries=10)
+        store.set("a", 1)
+        
+        assert store.get("a") == 1
+        assert store.get("missing", "default") == "default"
+    
+    def test_expired_entry_is_not_returned(self):
+        """Test that entries are dropped once their TTL has passed."""
+        store = ExpiringDict(ttl=60, max_entries=10)
+        with patch("src.local_store.time.monotonic", return_value=0):
+            store.set("a", 1)
+        
+        with patch("src.local_store.time.monotonic", return_value=61):
+            assert store.get("a") is None
+        assert len(store) == 0
+    
+    def test_expired_entries_are_pruned_on_write(self):
+        """Test that writes prune expired entries that are never read again."""
+        store = ExpiringDict(ttl=60, max_entries=10)
+        with patch("src.local_store.time.monotonic", return_value=0):
+            store.set("a", 1)
+            store.set("b", 2)
+        
+        with patch("src.local_store.time.monotonic", return_value=61):
+            store.set("c", 3)
+        
+        assert len(store) == 1
+    
+    def test_oldest_entry_is_evicted_when_full(self):
+        """Test that the least recently written entry is evicted at the size limit."""
+        store = ExpiringDict(ttl=60, max_entries=2)
+        store.set("a", 1)
+        store.set("b", 2)
+        store.set("a", 3)
+        store.set("c", 4)
+        
+        assert store.get("b") is None
+        assert store.get("a") == 3
+        assert store.get("c") == 4
+    
+    def test_pop(self):
+        """Test removing an entry."""
+        store = ExpiringDict(ttl=60, max_entries=10)
+        store.set("a", 1)
+        
+        assert store.pop("a") == 1
+        assert store.pop("a") is None
@@ -4,6 +4,7 @@ Unit tests for OpenAIClient with mocked API calls.
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from src.openai_client import OpenAIClient
+from src.response_cache import ExactCache, SemanticCache
 
 
 class TestOpenAIClient:
@@ -89,4 +90,138 @@ class TestOpenAIClient:
                 pass
         
         assert "OpenAI API error" in str(exc_info.value)
-
+    
+    @pytest.mark.asyncio
+    async def test_chat_completion_resp_streaming(self, mock_openai_client):
+        """Test streaming a chained Responses API turn."""
+        created = MagicMock(type="response.created")
+        created.response.id = "resp_2"
+        delta1 = MagicMock(type="response.output_text.delta", delta="Hello")
+        delta2 = MagicMock(type="response.output_text.delta", delta=" there")
+        
+        async def mock_stream():
+            for event in (created, delta1, delta2):
+                yield event
+        
+        mock_openai_client.responses.create = AsyncMock(return_value=mock_stream())
+        
+        client = OpenAIClient(api_key="test-key", model="gpt-4")
+        stream = client.chat_completion_resp("resp_1", "Hi")
+        
+        chunks = [chunk async for chunk in stream]
+        
+        assert chunks == ["Hello", " there"]
+        assert stream.response_id == "resp_2"
+        mock_openai_client.responses.create.assert_called_once_with(
+            model="gpt-4",
+            input="Hi",
+            previous_response_id="resp_1",
+            truncation="auto",
+            stream=True
+        )
+    
+    @pytest.mark.asyncio
+    async def test_chat_completion_resp_sync(self, mock_openai_client):
+        """Test a non-streaming Responses API turn."""
+        mock_response = MagicMock(id="resp_1", output_text="Hello there!")
+        mock_openai_client.responses.create = AsyncMock(return_value=mock_response)
+        
+        client = OpenAIClient(api_key="test-key", model="gpt-4")
+        response, response_id = await client.chat_completion_resp_sync(None, "Hi")
+        
+        assert response == "Hello there!"
+        assert response_id == "resp_1"
+    
+    @pytest.mark.asyncio
+    async def test_semantic_cache_miss_then_hit(self, mock_openai_client):
+        """Test that a response is cached on a miss and replayed on a hit."""
+        mock_embedding = MagicMock()
+        mock_embedding.data = [MagicMock(embedding=[1.0, 0.0])]
+        mock_openai_client.embeddings.create = AsyncMock(return_value=mock_embedding)
+        
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "x" * 100
+        mock_chat = MagicMock()
+        mock_chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_openai_client.chat = mock_chat
+        
+        client = OpenAIClient(api_key="test-key", model="gpt-4", semantic_cache=SemanticCache())
+        messages = [{"role": "user", "content": "Hi"}]
+        
+        assert await client.chat_completion_sync(messages) == "x" * 100
+        
+        chunks = []
+        async for chunk in client.chat_completion(messages, stream=True):
+            chunks.append(chunk)
+        
+        assert chunks == ["x" * 64, "x" * 36]
+        mock_chat.completions.create.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_exact_cache_skips_embedding(self, mock_openai_client):
+        """Test that an exact cache hit skips both the embedding and chat requests."""
+        mock_openai_client.embeddings.create = AsyncMock()
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "Hello there!"
+        mock_chat = MagicMock()
+        mock_chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_openai_client.chat = mock_chat
+        
+        client = OpenAIClient(api_key="test-key", model="gpt-4", exact_cache=ExactCache())
+        messages = [{"role": "user", "content": "Hi"}]
+        
+        assert await client.chat_completion_sync(messages) == "Hello there!"
+        
+        client.semantic_cache = SemanticCache()
+        assert await client.chat_completion_sync(messages) == "Hello there!"
+        
+        mock_chat.completions.create.assert_called_once()
+        mock_openai_client.embeddings.create.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_cache_errors_fall_back_to_api(self, mock_openai_client):
+        """Test that a failing cache does not prevent a response."""
+        mock_openai_client.embeddings.create = AsyncMock(side_effect=Exception("Embeddings down"))
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "Hello there!"
+        mock_chat = MagicMock()
+        mock_chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_openai_client.chat = mock_chat
+        
+        exact_cache = MagicMock()
+        exact_cache.get = AsyncMock(side_effect=Exception("Redis down"))
+        exact_cache.set = AsyncMock(side_effect=Exception("Redis down"))
+        client = OpenAIClient(
+            api_key="test-key",
+            model="gpt-4",
+            exact_cache=exact_cache,
+            semantic_cache=SemanticCache()
+        )
+        
+        response = await client.chat_completion_sync([{"role": "user", "content": "Hi"}])
+        
+        assert response == "Hello there!"
+        mock_chat.completions.create.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_use_cache_false_bypasses_caches(self, mock_openai_client):
+        """Test that use_cache=False neither reads nor writes the caches."""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "Hello there!"
+        mock_chat = MagicMock()
+        mock_chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_openai_client.chat = mock_chat
+        
+        exact_cache = ExactCache()
+        client = OpenAIClient(api_key="test-key", model="gpt-4", exact_cache=exact_cache)
+        messages = [{"role": "user", "content": "Hi"}]
+        
+        await client.chat_completion_sync(messages, use_cache=False)
+        await client.chat_completion_sync(messages, use_cache=False)
+        
+        assert mock_chat.completions.create.call_count == 2
+        assert len(exact_cache._local) == 0
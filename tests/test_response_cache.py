@@ -0,0 +1,121 @@
+"""
+Unit tests for the response caches.
+"""
+import pytest
+from unittest.mock import AsyncMock
+from src.response_cache import ExactCache, SemanticCache, messages_hash, prefix_hash
+
+
+class TestPrefixHash:
+    """Test cases for prefix_hash."""
+    
+    def test_ignores_latest_message(self):
+        """Test that only the context before the latest message is hashed."""
+        a = [{"role": "system", "content": "S"}, {"role": "user", "content": "Hi"}]
+        b = [{"role": "system", "content": "S"}, {"role": "user", "content": "Hello"}]
+        assert prefix_hash(a, "gpt-4") == prefix_hash(b, "gpt-4")
+    
+    def test_depends_on_context_and_model(self):
+        """Test that changing an earlier message or the model changes the hash."""
+        a = [{"role": "system", "content": "S"}, {"role": "user", "content": "Hi"}]
+        b = [{"role": "system", "content": "T"}, {"role": "user", "content": "Hi"}]
+        assert prefix_hash(a, "gpt-4") != prefix_hash(b, "gpt-4")
+        assert prefix_hash(a, "gpt-4") != prefix_hash(a, "gpt-4o")
+
+
+class TestMessagesHash:
+    """Test cases for messages_hash."""
+    
+    def test_depends_on_every_message(self):
+        """Test that editing any message changes the hash."""
+        a = [{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello"}]
+        b = [{"role": "user", "content": "Hey"}, {"role": "assistant", "content": "Hello"}]
+        assert messages_hash(a, "gpt-4") == messages_hash(list(a), "gpt-4")
+        assert messages_hash(a, "gpt-4") != messages_hash(b, "gpt-4")
+
+
+class TestExactCache:
+    """Test cases for ExactCache."""
+    
+    @pytest.mark.asyncio
+    async def test_get_and_set(self):
+        """Test caching and retrieving a response."""
+        cache = ExactCache()
+        assert await cache.get("abc") is None
+        
+        await cache.set("abc", "cached")
+        assert await cache.get("abc") == "cached"
+    
+    @pytest.mark.asyncio
+    async def test_in_memory_cache_is_bounded(self):
+        """Test that the in-memory fallback does not grow without limit."""
+        cache = ExactCache()
+        cache._local.max_entries = 2
+        for digest in ("a", "b", "c"):
+            await cache.set(digest, "cached")
+        
+        assert len(cache._local) == 2
+        assert await cache.get("a") is None
+    
+    @pytest.mark.asyncio
+    async def test_set_with_redis_sets_ttl(self):
+        """Test that caching to Redis uses the exact key and TTL."""
+        redis_client = AsyncMock()
+        cache = ExactCache(redis_client, ttl=60)
+        
+        await cache.set("abc", "cached")
+        
+        redis_client.set.assert_called_once_with("exact:abc", "cached", ex=60)
+
+
+class TestSemanticCache:
+    """Test cases for SemanticCache."""
+    
+    @pytest.mark.asyncio
+    async def test_similar_embedding_hits(self):
+        """Test that a sufficiently similar embedding returns the cached response."""
+        cache = SemanticCache(threshold=0.95)
+        await cache.store("ns", [1.0, 0.0], "cached")
+        
+        assert await cache.lookup("ns", [0.99, 0.05]) == "cached"
+    
+    @pytest.mark.asyncio
+    async def test_dissimilar_embedding_misses(self):
+        """Test that a dissimilar embedding is a miss."""
+        cache = SemanticCache(threshold=0.95)
+        await cache.store("ns", [1.0, 0.0], "cached")
+        
+        assert await cache.lookup("ns", [0.0, 1.0]) is None
+    
+    @pytest.mark.asyncio
+    async def test_namespaces_are_isolated(self):
+        """Test that entries are only reused within their namespace."""
+        cache = SemanticCache(threshold=0.95)
+        await cache.store("ns", [1.0, 0.0], "cached")
+        
+        assert await cache.lookup("other", [1.0, 0.0]) is None
+    
+    @pytest.mark.asyncio
+    async def test_best_match_wins(self):
+        """Test that the most similar entry is returned."""
+        cache = SemanticCache(threshold=0.9)
+        await cache.store("ns", [1.0, 0.1], "close")
+        await cache.store("ns", [1.0, 0.0], "exact")
+        
+        assert await cache.lookup("ns", [1.0, 0.0]) == "exact"
+    
+    @pytest.mark.asyncio
+    async def test_zero_threshold_is_respected(self):
+        """Test that an explicit threshold of 0.0 is not replaced by the default."""
+        cache = SemanticCache(threshold=0.0)
+        assert cache.threshold == 0.0
+    
+    @pytest.mark.asyncio
+    async def test_in_memory_namespaces_are_bounded(self):
+        """Test that the in-memory fallback does not grow without limit."""
+        cache = SemanticCache()
+        cache._local.max_entries = 2
+        for namespace in ("a", "b", "c"):
+            await cache.store(namespace, [1.0, 0.0], "cached")
+        
+        assert len(cache._local) == 2
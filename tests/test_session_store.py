@@ -0,0 +1,115 @@
+"""
+Unit tests for SessionStore with in-memory and mocked Redis backends.
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock
+from src.conversation_manager import ConversationManager
+from src.session_store import SessionStore
+
+
+class TestSessionStore:
+    """Test cases for SessionStore."""
+    
+    @pytest.mark.asyncio
+    async def test_load_unknown_conversation(self):
+        """Test loading an unknown conversation returns a new one."""
+        store = SessionStore()
+        conversation = await store.load("missing")
+        
+        assert conversation.get_conversation_length() == 0
+        assert conversation.get_messages()[0]["role"] == "system"
+    
+    @pytest.mark.asyncio
+    async def test_save_and_load_in_memory(self):
+        """Test round-tripping a conversation through the in-memory store."""
+        store = SessionStore()
+        conversation = ConversationManager(system_message="Be brief.")
+        conversation.add_user_message("Hello")
+        conversation.add_assistant_message("Hi!")
+        
+        await store.save("abc", conversation)
+        loaded = await store.load("abc")
+        
+        assert loaded.get_messages() == conversation.get_messages()
+    
+    @pytest.mark.asyncio
+    async def test_conversations_are_isolated(self):
+        """Test that conversations with different IDs do not share history."""
+        store = SessionStore()
+        conversation = ConversationManager()
+        conversation.add_user_message("Hello")
+        await store.save("a", conversation)
+        
+        other = await store.load("b")
+        assert other.get_conversation_length() == 0
+    
+    @pytest.mark.asyncio
+    async def test_delete(self):
+        """Test deleting a conversation."""
+        store = SessionStore()
+        conversation = ConversationManager()
+        conversation.add_user_message("Hello")
+        await store.save("abc", conversation)
+        
+        await store.delete("abc")
+        loaded = await store.load("abc")
+        assert loaded.get_conversation_length() == 0
+    
+    @pytest.mark.asyncio
+    async def test_load_passes_summarize_setting(self):
+        """Test that loaded conversations only keep dropped messages when summarizing."""
+        conversation = ConversationManager(max_turns=1, summarize=True)
+        for i in range(2):
+            conversation.add_user_message(f"Question {i}")
+            conversation.add_assistant_message(f"Answer {i}")
+        
+        store = SessionStore(summarize=False)
+        await store.save("abc", conversation)
+        loaded = await store.load("abc")
+        
+        assert loaded.summarize is False
+        assert loaded.dropped == []
+    
+    @pytest.mark.asyncio
+    async def test_in_memory_store_is_bounded(self):
+        """Test that the in-memory fallback does not grow without limit."""
+        store = SessionStore()
+        store._local.max_entries = 2
+        for conversation_id in ("a", "b", "c"):
+            await store.save(conversation_id, ConversationManager())
+        
+        assert len(store._local) == 2
+    
+    @pytest.mark.asyncio
+    async def test_save_with_redis_sets_ttl(self):
+        """Test that saving to Redis uses the conversation key and TTL."""
+        redis_client = AsyncMock()
+        store = SessionStore(redis_client, ttl=60)
+        conversation = ConversationManager()
+        conversation.add_user_message("Hello")
+        
+        await store.save("abc", conversation)
+        
+        redis_client.set.assert_called_once_with(
+            "conv:abc",
+            json.dumps(conversation.to_dict()),
+            ex=60
+        )
+    
+    @pytest.mark.asyncio
+    async def test_load_with_redis(self):
+        """Test loading a conversation from Redis."""
+        messages = [
+            {"role": "system", "content": "Be brief."},
+            {"role": "user", "content": "Hello"}
+        ]
+        redis_client = AsyncMock()
+        redis_client.get.return_value = json.dumps({"messages": messages, "last_response_id": "resp_1"})
+        store = SessionStore(redis_client)
+        
+        conversation = await store.load("abc")
+        
+        redis_client.get.assert_called_once_with("conv:abc")
+        assert conversation.get_messages() == messages
+        assert conversation.last_response_id == "resp_1"